@@ -1,28 +1,80 @@
 # main.py (or app.py) - This will be your FastAPI application
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+import asyncio
+import atexit
+import concurrent.futures
+import json
 import os
-import time
-import shutil
-
-# Selenium imports
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.firefox.service import Service as FirefoxService
+import re
+import threading
+
+# HTTP scraping imports
+import httpx
+from selectolax.parser import HTMLParser
+
+# Background job imports
+import dramatiq
+import redis
+from dramatiq.brokers.redis import RedisBroker
+from dramatiq.middleware import CurrentMessage
+
+# Playwright imports
+from playwright.async_api import async_playwright, Browser, Page, Playwright
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 
 # --- Configuration Constants ---
 DEFAULT_WEBSITE_URL = "https://safer.fmcsa.dot.gov/CompanySnapshot.aspx"
-SELENIUM_WAIT_TIMEOUT = 20 # Default wait time for Selenium elements
-TEMP_UPLOAD_DIR = "temp_uploads" # Directory to temporarily store uploaded files
-
-# Ensure temp directory exists
-os.makedirs(TEMP_UPLOAD_DIR, exist_ok=True)
+SCRAPE_BACKEND = os.getenv("SCRAPE_BACKEND", "http").lower() # "http" (direct requests) or "playwright" (headless Firefox fallback)
+BROWSER_WAIT_TIMEOUT = 20 # Default wait time for browser elements and navigations, in seconds
+CLOSE_MODAL_TIMEOUT = 3 # The modal close button is either there right away or not at all
+HTTP_TIMEOUT = 20 # Default timeout for direct HTTP requests
+HTTP_MAX_CONNECTIONS = 20 # Concurrent connections to the FMCSA servers per request
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", min(os.cpu_count() or 1, 8))) # Browser pages kept warm, and max parallel browser scrapes
+PAGE_POOL_TIMEOUT = 30 # Seconds to wait for a free browser page before giving up
+RESULT_CACHE_TTL = 24 * 3600 # Seconds a scrape result is reused; carrier data rarely changes within a day
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0") # Job broker, job results and result cache
+JOB_RESULT_TTL = 24 * 3600 # Seconds a finished job's results can be fetched
+JOB_TIME_LIMIT = 60 * 60 * 1000 # Milliseconds a single scrape job may run
+JOB_SCRAPE_TIMEOUT = JOB_TIME_LIMIT / 1000 - 60 # Seconds before a job's scrape is cancelled; leaves room to store the failure
+
+# Placeholder for fields that could not be scraped
+_NA = "N/A"
+_NA_TUPLE = (_NA, _NA, _NA) # (email, name, phone) when nothing was found
+
+# --- Page Selectors (shared by the Playwright and HTTP scrapers) ---
+SEL_RADIO = "#\\32"
+SEL_INPUT = "#\\34"
+SEL_SUBMIT = "body > form > p > table > tbody > tr:nth-child(4) > td > input[type=SUBMIT]"
+SEL_SMS_LINK = "body > p > table > tbody > tr:nth-child(2) > td > table > tbody > tr:nth-child(2) > td > table:nth-child(1) > tbody > tr:nth-child(3) > td > table > tbody > tr:nth-child(2) > td > table > tbody > tr:nth-child(3) > td:nth-child(2) > font > a"
+SEL_CARRIER_BTN = "#CarrierRegistration > a:nth-child(2)"
+SEL_REGBOX = "#regBox"
+SEL_NAME = "#regBox > ul.col1 > li:nth-child(1) > span"
+SEL_PHONE = "#regBox > ul.col1 > li:nth-child(5) > span"
+SEL_EMAIL = "#regBox > ul.col1 > li:nth-child(7) > span"
+SEL_CLOSE = "xpath=//div[@id='CarrierRegistration']//img[@alt='Close'] | //div[@id='CarrierRegistration']//button[contains(.,'X')]"
+
+# One number per line; a leading "234" is stripped when at least 7 digits follow it
+# Lines may end in \n, \r\n or a lone \r; any other whitespace around a number is ignored
+_NUM_RE = re.compile(rb"(?:^|(?<=[\r\n]))[^\S\r\n]*(?:234(?=\d{7}))?(\d+)[^\S\r\n]*(?=[\r\n]|\Z)")
+_NON_BLANK_LINE_RE = re.compile(rb"(?:^|(?<=[\r\n]))[^\S\r\n]*\S")
+
+# Skip resources the scraper never reads. Stylesheets stay on: the modal visibility waits depend on them.
+FIREFOX_PREFS = {
+    "permissions.default.image": 2, # Block images
+    "browser.display.use_document_fonts": 0, # Block web fonts
+    "dom.webnotifications.enabled": False,
+    "media.autoplay.default": 5, # Block all autoplay
+    "browser.cache.disk.enable": False,
+    "browser.cache.memory.enable": True,
+    "browser.cache.memory.capacity": 131072, # 128 MB in-RAM cache, so repeat navigations reuse unchanged assets
+    "network.http.use-cache": True,
+    "network.http.max-persistent-connections-per-server": 10,
+}
 
 app = FastAPI(
     title="NexusFetcher API",
@@ -30,6 +82,23 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Scraping runs in Dramatiq workers (`dramatiq main`); the API only enqueues jobs and reads their results
+broker = RedisBroker(url=REDIS_URL)
+broker.add_middleware(CurrentMessage())
+dramatiq.set_broker(broker)
+_redis = redis.Redis.from_url(REDIS_URL)
+
+# Pre-opened browser pages, each in its own context, checked out per scrape and returned afterwards.
+# Worker-side only: owned by the job loop started in _get_job_loop.
+PAGE_POOL: "asyncio.Queue[Optional[Page]]" = asyncio.Queue(maxsize=POOL_SIZE) # None marks a slot whose page could not be reopened
+# Bounds browser scrapes in flight across all jobs, so the pool checkout timeout only starts once it is a number's turn
+PAGE_SEMAPHORE = asyncio.Semaphore(POOL_SIZE)
+_BROWSER_LOCK = asyncio.Lock() # Serializes relaunching Firefox after it dies
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_job_loop: Optional[asyncio.AbstractEventLoop] = None
+_job_loop_lock = threading.Lock()
+
 # --- Pydantic Models for Request/Response ---
 class ScrapeRequest(BaseModel):
     website_url: str = DEFAULT_WEBSITE_URL
@@ -48,114 +117,429 @@ class ScrapeResponse(BaseModel):
     total_processed: int
     errors: List[str] = []
 
+class JobStatus(BaseModel):
+    job_id: str
+    status: str = "pending"
+
 # --- Core Scraping Logic (Adapted from AutomationCore) ---
-def _perform_single_scrape(driver, wait, website_url: str, number: str, logs: List[str]):
+def _extract_details(tree: HTMLParser, logs: List[str]):
     """
-    Performs the scraping for a single number.
-    Returns (email, name, phone) or (N/A, N/A, N/A) on failure.
-    Logs are appended to the provided list.
+    Reads the carrier name, phone and email from a parsed carrier details page.
+    Returns (email, name, phone), with N/A for each field that is missing.
     """
-    email, name, phone = "N/A", "N/A", "N/A" # Default values
+    email = name = phone = _NA # Default values
+
+    name_element = tree.css_first(SEL_NAME)
+    if name_element:
+        name = name_element.text(strip=True)
+    else:
+        logs.append("Name element not found.")
+
+    phone_element = tree.css_first(SEL_PHONE)
+    if phone_element:
+        phone = phone_element.text(strip=True)
+    else:
+        logs.append("Phone element not found.")
+
+    email_element = tree.css_first(SEL_EMAIL)
+    if email_element:
+        email = email_element.text(strip=True)
+        logs.append(f"Found Email: {email}")
+    else:
+        logs.append("Email element not found.")
 
-    try:
-        driver.get(website_url)
-        logs.append(f"Navigated to: {website_url}")
+    return email, name, phone
+
+async def _setup_form(page: Page, website_url: str, logs: List[str]):
+    """
+    Loads the search form and selects the search-type radio button.
+    Called once per page; _query_one then reuses the loaded form for every number.
+    """
+    await page.goto(website_url)
+    logs.append(f"Navigated to: {website_url}")
+
+    await page.click(SEL_RADIO)
+    logs.append("Clicked the radio button (#\\32).")
+
+async def _submit_search(page: Page, number: str, logs: List[str]):
+    """Enters a number into the loaded search form and submits it."""
+    await page.fill(SEL_INPUT, number)
+    logs.append(f"Entered '{number}' into search input.")
+
+    await page.click(SEL_SUBMIT)
+    logs.append("Clicked Search button.")
 
-        radio_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#\\32")))
-        radio_button.click()
-        logs.append("Clicked the radio button (#\\32).")
+async def _return_to_form(page: Page, website_url: str, pages_visited: int, logs: List[str]):
+    """Steps back through history to the search form, reloading it if it did not come back."""
+    for _ in range(pages_visited):
+        await page.go_back()
+    if await page.query_selector(SEL_INPUT) is None:
+        logs.append("Search form not restored by navigating back. Reloading it.")
+        await _setup_form(page, website_url, logs)
 
-        search_input = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#\\34")))
-        search_input.clear()
-        search_input.send_keys(number)
-        logs.append(f"Entered '{number}' into search input.")
+async def _query_one(page: Page, website_url: str, number: str, logs: List[str]):
+    """
+    Performs the scraping for a single number from the search form loaded by _setup_form.
+    Returns (email, name, phone) or (N/A, N/A, N/A) on failure, leaving the page back on the search form.
+    Logs are appended to the provided list.
+    """
+    email = name = phone = _NA # Default values
+    pages_visited = 0 # History entries to step back through to reach the search form again
 
-        search_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "body > form > p > table > tbody > tr:nth-child(4) > td > input[type=SUBMIT]")))
-        search_button.click()
-        logs.append("Clicked Search button.")
+    try:
+        try:
+            await _submit_search(page, number, logs)
+        except PlaywrightTimeoutError:
+            logs.append("Search form was missing. Reloading it.")
+            await _setup_form(page, website_url, logs)
+            await _submit_search(page, number, logs)
+        pages_visited = 1
 
         # --- Check for 'No Result Found' or valid SMS result link ---
         try:
-            sms_result_link = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "body > p > table > tbody > tr:nth-child(2) > td > table > tbody > tr:nth-child(2) > td > table:nth-child(1) > tbody > tr:nth-child(3) > td > table > tbody > tr:nth-child(2) > td > table > tbody > tr:nth-child(3) > td:nth-child(2) > font > a"))
-            )
-            sms_result_link.click()
+            await page.click(SEL_SMS_LINK)
+            pages_visited = 2
             logs.append("Clicked 'SMS result' link.")
 
-            carrier_details_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#CarrierRegistration > a:nth-child(2)")))
-            carrier_details_button.click()
+            await page.click(SEL_CARRIER_BTN)
             logs.append("Clicked 'Carrier Details' button.")
 
-            wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "#regBox")))
+            await page.wait_for_selector(SEL_REGBOX, state="visible")
             logs.append("Carrier details modal/section loaded.")
 
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5) # Small pause to allow content to render after scroll
-
             try:
-                name_element = driver.find_element(By.CSS_SELECTOR, "#regBox > ul.col1 > li:nth-child(1) > span")
-                name = name_element.text.strip()
-            except NoSuchElementException:
-                logs.append("Name element not found.")
+                await page.wait_for_selector(SEL_NAME, state="visible") # Details render inside #regBox after it opens
+            except PlaywrightTimeoutError:
+                logs.append("Carrier details did not render in time.")
 
-            try:
-                phone_element = driver.find_element(By.CSS_SELECTOR, "#regBox > ul.col1 > li:nth-child(5) > span")
-                phone = phone_element.text.strip()
-            except NoSuchElementException:
-                logs.append("Phone element not found.")
+            # One page content transfer, then all lookups happen in-process
+            email, name, phone = _extract_details(HTMLParser(await page.content()), logs)
 
             try:
-                email_element = driver.find_element(By.CSS_SELECTOR, "#regBox > ul.col1 > li:nth-child(7) > span")
-                email = email_element.text.strip()
-                logs.append(f"Found Email: {email}")
-            except NoSuchElementException:
-                logs.append("Email element not found.")
-
-            try:
-                close_modal_button = wait.until(EC.element_to_be_clickable(
-                    (By.XPATH, "//div[@id='CarrierRegistration']//img[@alt='Close'] | //div[@id='CarrierRegistration']//button[contains(.,'X')]")
-                ))
-                close_modal_button.click()
+                await page.click(SEL_CLOSE, timeout=CLOSE_MODAL_TIMEOUT * 1000)
                 logs.append("Closed the carrier details modal.")
-            except (TimeoutException, NoSuchElementException):
+            except PlaywrightTimeoutError:
                 logs.append("No explicit close button for modal found or not clickable.")
-            
-        except TimeoutException:
+
+        except PlaywrightTimeoutError:
             logs.append(f"Timeout: No SMS result link found or page did not load within time for number {number}. Skipping details extraction.")
-        except NoSuchElementException as e:
-            logs.append(f"Element not found: {e} for number {number}. Skipping details extraction.")
 
-    except WebDriverException as e:
-        logs.append(f"WebDriver error for number {number}: {e}. Browser might have crashed or disconnected.")
+    except PlaywrightError as e:
+        logs.append(f"Browser error for number {number}: {e}. Browser might have crashed or disconnected.")
         raise # Re-raise to be caught by the outer try-except
     except Exception as e:
         logs.append(f"An unexpected error occurred for number {number}: {e}")
 
+    await _return_to_form(page, website_url, pages_visited, logs)
     return email, name, phone
 
-def _read_numbers_from_file_api(filepath: str, logs: List[str]) -> List[str]:
-    """Reads numbers from file, extracting the relevant part, for API context."""
-    numbers = []
+async def _fetch_one(client: httpx.AsyncClient, website_url: str, number: str, logs: List[str]):
+    """
+    Performs the scraping for a single number with plain HTTP requests, following the same pages as _query_one.
+    Returns (email, name, phone) or (N/A, N/A, N/A) if the carrier details are not found.
+    Network errors are raised to the caller.
+    """
+    response = await client.post(
+        urljoin(website_url, "query.asp"),
+        data={"searchtype": "ANY", "query_type": "queryCarrierSnapshot", "query_param": "MC_MX", "query_string": number},
+    )
+    response.raise_for_status()
+    logs.append(f"Submitted search for '{number}'.")
+
+    sms_result_link = HTMLParser(response.text).css_first(SEL_SMS_LINK)
+    if sms_result_link is None or not sms_result_link.attributes.get("href"):
+        logs.append(f"No SMS result link found for number {number}. Skipping details extraction.")
+        return _NA_TUPLE
+
+    response = await client.get(urljoin(str(response.url), sms_result_link.attributes["href"]))
+    response.raise_for_status()
+    logs.append("Fetched 'SMS result' page.")
+    tree = HTMLParser(response.text)
+
+    # The carrier details modal is filled from its own page; follow it unless it is already inlined
+    carrier_details_link = tree.css_first(SEL_CARRIER_BTN)
+    href = carrier_details_link.attributes.get("href") if carrier_details_link else None
+    if tree.css_first(SEL_REGBOX) is None and href and not href.startswith(("#", "javascript:")):
+        response = await client.get(urljoin(str(response.url), href))
+        response.raise_for_status()
+        logs.append("Fetched 'Carrier Details' page.")
+        tree = HTMLParser(response.text)
+
+    if tree.css_first(SEL_REGBOX) is None:
+        logs.append(f"Carrier details section not found for number {number}. Skipping details extraction.")
+        return _NA_TUPLE
+
+    return _extract_details(tree, logs)
+
+def _filter_numbers(data: bytes, logs: List[str]) -> List[str]:
+    """Extracts the numbers from raw uploaded file contents in a single regex scan, for API context."""
+    numbers = [match.decode() for match in _NUM_RE.findall(data)]
+    malformed_count = len(_NON_BLANK_LINE_RE.findall(data)) - len(numbers)
+    if malformed_count:
+        logs.append(f"Skipped {malformed_count} malformed line(s) in file.")
+    if not numbers:
+        logs.append("No valid numbers found in the file after filtering.")
+    return numbers
+
+# --- Browser Page Pool ---
+async def _launch_browser() -> Browser:
+    return await _playwright.firefox.launch(headless=True, firefox_user_prefs=FIREFOX_PREFS)
+
+def _page_is_dead(page: Page) -> bool:
+    """True if the page, or the Firefox process behind it, is gone. Checked locally, without a browser round trip."""
+    return page.is_closed() or not page.context.browser.is_connected()
+
+async def _new_page() -> Page:
+    """
+    Opens a new page in its own browser context, so cookies are never shared between pages.
+    Relaunches Firefox first if its process has died, so the pool can refill.
+    """
+    global _browser
+    async with _BROWSER_LOCK:
+        if not _browser.is_connected():
+            _browser = await _launch_browser()
+    context = await _browser.new_context()
+    context.set_default_timeout(BROWSER_WAIT_TIMEOUT * 1000)
+    return await context.new_page()
+
+async def _replace_page(page: Optional[Page], logs: List[str]) -> Optional[Page]:
+    """Closes a dead page's context, if any, and opens a fresh page, or returns None if that fails."""
+    if page is not None:
+        try:
+            await page.context.close()
+        except PlaywrightError:
+            pass
     try:
-        with open(filepath, 'r') as f:
-            for line in f:
-                stripped_line = line.strip()
-                if stripped_line:
-                    if stripped_line.startswith("234") and len(stripped_line) >= 10:
-                        numbers.append(stripped_line[3:])
-                    elif stripped_line.isdigit():
-                        numbers.append(stripped_line)
-                    else:
-                        logs.append(f"Skipping malformed line in file: '{stripped_line}'")
-        if not numbers:
-            logs.append("No valid numbers found in the file after filtering.")
-        return numbers
-    except FileNotFoundError:
-        logs.append(f"Error: Numbers file not found at '{filepath}'.")
-        raise HTTPException(status_code=400, detail=f"Numbers file not found at '{filepath}'.")
+        return await _new_page()
+    except PlaywrightError as e:
+        logs.append(f"Could not open a new browser page: {e}. Retrying on the slot's next checkout.")
+        return None
+
+async def _release_page(page: Page, logs: List[str]):
+    """
+    Returns a checked-out page to the pool, replacing it if it or its browser has died.
+    If no replacement can be opened, the slot goes back empty (None), so the pool never shrinks below PAGE_SEMAPHORE.
+    The loaded search form, cookies and HTTP cache are kept warm for the next scrape. website_url comes from
+    the client, so _scrape_on_pool clears cookies before a page is reused for a different origin.
+    """
+    if _page_is_dead(page):
+        logs.append("Browser page or browser was dead on release. Replacing it.")
+        page = await _replace_page(page, logs)
+    PAGE_POOL.put_nowait(page)
+
+async def start_page_pool():
+    global _playwright, _browser
+    if SCRAPE_BACKEND != "playwright":
+        return
+    _playwright = await async_playwright().start()
+    _browser = await _launch_browser()
+    for _ in range(POOL_SIZE):
+        PAGE_POOL.put_nowait(await _new_page())
+
+async def stop_page_pool():
+    global _playwright, _browser
+    while not PAGE_POOL.empty():
+        page = PAGE_POOL.get_nowait()
+        if page is None:
+            continue
+        try:
+            await page.context.close()
+        except PlaywrightError:
+            pass # Already closed
+    if _browser:
+        await _browser.close()
+        _browser = None
+    if _playwright:
+        await _playwright.stop()
+        _playwright = None
+
+def _get_job_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns this worker process's background event loop, starting it and the page pool on first use.
+    All actor threads submit their scrapes to this one loop, so they share the pool.
+    """
+    global _job_loop
+    with _job_loop_lock:
+        if _job_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="scrape-job-loop", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(start_page_pool(), loop).result()
+            except BaseException:
+                # Tear down the half-started pool and the loop, so the next job retries from scratch without leaking them
+                try:
+                    asyncio.run_coroutine_threadsafe(stop_page_pool(), loop).result(timeout=10)
+                except Exception:
+                    pass
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+            atexit.register(lambda: asyncio.run_coroutine_threadsafe(stop_page_pool(), loop).result(timeout=10))
+            _job_loop = loop
+    return _job_loop
+
+def _origin(url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc
+
+async def _scrape_on_pool(website_url: str, number: str, logs: List[str]):
+    """Checks out a pooled page, scrapes one number on it and returns the page to the pool."""
+    async with PAGE_SEMAPHORE:
+        try:
+            page = await asyncio.wait_for(PAGE_POOL.get(), timeout=PAGE_POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"No browser page became available within {PAGE_POOL_TIMEOUT} seconds.") from None
+        if page is None or _page_is_dead(page):
+            logs.append("Checked out an empty or dead browser page slot. Opening a new page.")
+            page = await _replace_page(page, logs)
+            if page is None:
+                PAGE_POOL.put_nowait(None) # Keep the slot, so a later checkout retries once Firefox is back
+                raise RuntimeError("No working browser page is available.")
+        try:
+            if page.url != website_url:
+                if _origin(page.url) != _origin(website_url):
+                    # Cookies set while scraping another origin (possibly another client's website_url) must not carry over
+                    await page.context.clear_cookies()
+                await _setup_form(page, website_url, logs)
+            return await _query_one(page, website_url, number, logs)
+        finally:
+            await _release_page(page, logs)
+
+def _collect_outcomes(numbers_to_scrape: List[str], outcomes: list, logs: List[str]) -> Tuple[List[ScrapeResult], List[str]]:
+    """Turns per-number (email, name, phone) tuples or exceptions into results and errors, keeping input order."""
+    results = []
+    errors = []
+    for number, outcome in zip(numbers_to_scrape, outcomes):
+        if isinstance(outcome, BaseException): # Includes CancelledError, which gather also returns
+            errors.append(f"Failed to process number {number}: {outcome}")
+            logs.append(f"Error processing {number}: {outcome}")
+            results.append(ScrapeResult(number_searched=number, email=_NA, name=_NA, phone=_NA)) # Add N/A result
+        else:
+            email, name, phone = outcome
+            results.append(ScrapeResult(number_searched=number, email=email, name=name, phone=phone))
+    return results, errors
+
+async def _scrape_with_playwright(website_url: str, numbers_to_scrape: List[str], logs: List[str]) -> Tuple[List[ScrapeResult], List[str]]:
+    """Scrapes the numbers concurrently on pooled browser pages; PAGE_SEMAPHORE bounds how many run at once."""
+    outcomes = await asyncio.gather(
+        *[_scrape_on_pool(website_url, number, logs) for number in numbers_to_scrape],
+        return_exceptions=True,
+    )
+    return _collect_outcomes(numbers_to_scrape, outcomes, logs)
+
+async def _scrape_with_http(website_url: str, numbers_to_scrape: List[str], logs: List[str]) -> Tuple[List[ScrapeResult], List[str]]:
+    """
+    Fetches the numbers concurrently over one shared HTTP client.
+    At most HTTP_MAX_CONNECTIONS numbers are in flight, so requests never queue long enough on the
+    connection pool to hit its timeout, and a large batch does not flood the FMCSA servers.
+    """
+    semaphore = asyncio.Semaphore(HTTP_MAX_CONNECTIONS)
+
+    async def _run(number: str):
+        async with semaphore:
+            return await _fetch_one(client, website_url, number, logs)
+
+    limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS)
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=HTTP_TIMEOUT, follow_redirects=True) as client:
+        outcomes = await asyncio.gather(*[_run(number) for number in numbers_to_scrape], return_exceptions=True)
+    return _collect_outcomes(numbers_to_scrape, outcomes, logs)
+
+def _result_cache_key(website_url: str, number: str) -> str:
+    return f"nexus:result:{website_url}:{number}"
+
+def _job_key(job_id: str) -> str:
+    return f"nexus:job:{job_id}"
+
+async def _scrape_pending(website_url: str, pending: List[str], logs: List[str]) -> Tuple[List[ScrapeResult], List[str]]:
+    """Scrapes cache misses with the configured SCRAPE_BACKEND. Runs on the job loop."""
+    if SCRAPE_BACKEND == "playwright":
+        return await _scrape_with_playwright(website_url, pending, logs)
+    return await _scrape_with_http(website_url, pending, logs)
+
+def _scrape_numbers(website_url: str, numbers_to_scrape: List[str], logs: List[str]) -> ScrapeResponse:
+    """
+    Scrapes the numbers with the configured SCRAPE_BACKEND, serving recently found carriers from the Redis result cache.
+    Blocking; runs in a Dramatiq actor thread. Redis I/O stays here so it never stalls the shared job loop.
+    Raises RuntimeError on failures outside of a single number's scrape.
+    """
+    unique_numbers = list(dict.fromkeys(numbers_to_scrape)) # Dedups, preserving order
+    if len(unique_numbers) < len(numbers_to_scrape):
+        logs.append(f"Skipped {len(numbers_to_scrape) - len(unique_numbers)} duplicate number(s).")
+
+    cached = {}
+    cache_keys = [_result_cache_key(website_url, number) for number in unique_numbers]
+    for number, raw in zip(unique_numbers, _redis.mget(cache_keys)):
+        if raw is not None:
+            cached[number] = ScrapeResult(**json.loads(raw))
+    pending = [number for number in unique_numbers if number not in cached]
+    if cached:
+        logs.append(f"Served {len(cached)} number(s) from cache.")
+
+    scraped, errors = [], []
+    if pending:
+        try:
+            loop = _get_job_loop() # Before building the coroutine, so a failed pool start leaves no unawaited coroutine behind
+            future = asyncio.run_coroutine_threadsafe(_scrape_pending(website_url, pending, logs), loop)
+            try:
+                scraped, errors = future.result(timeout=JOB_SCRAPE_TIMEOUT)
+            except BaseException:
+                future.cancel() # Stop the coroutine on the loop so it releases its pooled pages
+                raise
+        except concurrent.futures.TimeoutError:
+            error_msg = f"Scraping did not finish within {JOB_SCRAPE_TIMEOUT:.0f} seconds and was cancelled."
+            logs.append(error_msg)
+            raise RuntimeError(error_msg) from None
+        except PlaywrightError as e:
+            error_msg = f"Critical browser error during initialization or execution: {e}. Ensure Playwright's Firefox is installed on the server (`playwright install firefox`)."
+            logs.append(error_msg)
+            raise RuntimeError(error_msg) from e
+
+    with _redis.pipeline() as pipe:
+        for result in scraped:
+            if (result.email, result.name, result.phone) != _NA_TUPLE: # Only cache carriers that were found
+                pipe.set(_result_cache_key(website_url, result.number_searched), json.dumps(jsonable_encoder(result)), ex=RESULT_CACHE_TTL)
+        pipe.execute()
+
+    result_map = {**cached, **{result.number_searched: result for result in scraped}}
+    results = [result_map[number] for number in numbers_to_scrape] # Expand back to the full input
+
+    return ScrapeResponse(
+        status="success" if not errors else "completed_with_errors",
+        message="Scraping completed." if not errors else "Scraping completed with some errors. Check 'errors' list.",
+        results=results,
+        total_processed=len(results), # Failed numbers still count as processed
+        errors=errors
+    )
+
+# --- Background Jobs ---
+@dramatiq.actor(max_retries=0, time_limit=JOB_TIME_LIMIT)
+def scrape_job(numbers_to_scrape: List[str], website_url: str):
+    """
+    Scrapes a batch in a worker process and stores the ScrapeResponse in Redis under the job's message ID.
+    Always replaces the pending marker, storing a "failed" response if the scrape does not complete.
+    """
+    job_id = CurrentMessage.get_current_message().message_id
+    logs = []
+    response = _failed_response("Scrape job was interrupted before it finished.")
+    try:
+        response = _scrape_numbers(website_url, numbers_to_scrape, logs)
     except Exception as e:
-        logs.append(f"Error reading numbers file: {e}")
-        raise HTTPException(status_code=500, detail=f"Error reading numbers file: {e}")
+        response = _failed_response(f"Scrape job failed: {e}")
+    finally:
+        _redis.set(_job_key(job_id), json.dumps(jsonable_encoder(response)), ex=JOB_RESULT_TTL)
+
+def _failed_response(error_msg: str) -> ScrapeResponse:
+    return ScrapeResponse(status="failed", message=error_msg, results=[], total_processed=0, errors=[error_msg])
+
+def _enqueue_scrape(website_url: str, numbers_to_scrape: List[str]) -> JobStatus:
+    """Marks a new job as pending, then enqueues it; the pending marker is written first so it never overwrites results."""
+    message = scrape_job.message(numbers_to_scrape, website_url)
+    job = JobStatus(job_id=message.message_id)
+    _redis.set(_job_key(job.job_id), json.dumps(jsonable_encoder(job)), ex=JOB_RESULT_TTL)
+    broker.enqueue(message)
+    return job
 
 # --- API Endpoints ---
 
@@ -163,10 +547,31 @@ def _read_numbers_from_file_api(filepath: str, logs: List[str]) -> List[str]:
 async def root():
     return {"message": "Welcome to NexusFetcher API. Visit /docs for API documentation."}
 
-@app.post("/scrape_by_numbers", response_model=ScrapeResponse)
-async def scrape_by_numbers(request: ScrapeRequest):
+@app.post("/cache/clear")
+def clear_cache():
+    """
+    Drops all cached scrape results, forcing the next requests to scrape again.
+    """
+    keys = list(_redis.scan_iter(match=_result_cache_key("*", "*")))
+    if keys:
+        _redis.delete(*keys)
+    return {"message": f"Cleared {len(keys)} cached result(s)."}
+
+@app.get("/results/{job_id}", response_model=Union[ScrapeResponse, JobStatus])
+def get_results(job_id: str):
     """
-    Scrapes data for a list of numbers provided in the request body.
+    Returns the ScrapeResponse of a finished job, or its pending status.
+    """
+    raw = _redis.get(_job_key(job_id))
+    if raw is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job '{job_id}'.")
+    return json.loads(raw)
+
+@app.post("/scrape_by_numbers", response_model=JobStatus, status_code=202)
+def scrape_by_numbers(request: ScrapeRequest):
+    """
+    Queues a scrape for a list of numbers provided in the request body.
+    Poll /results/{job_id} for the outcome.
     """
     website_url = request.website_url
     numbers_to_scrape = request.numbers
@@ -174,144 +579,48 @@ async def scrape_by_numbers(request: ScrapeRequest):
     if not numbers_to_scrape:
         raise HTTPException(status_code=400, detail="No numbers provided for scraping.")
 
-    results = []
-    errors = []
-    logs = []
-    processed_count = 0
-
-    driver = None
-    try:
-        logs.append("Initializing Firefox WebDriver...")
-        service = FirefoxService(GeckoDriverManager().install())
-        options = webdriver.FirefoxOptions()
-        options.add_argument("--headless") # Run headless on the server for efficiency
-        driver = webdriver.Firefox(service=service, options=options)
-        wait = WebDriverWait(driver, SELENIUM_WAIT_TIMEOUT)
-        logs.append("WebDriver initialized.")
-
-        for number in numbers_to_scrape:
-            try:
-                email, name, phone = _perform_single_scrape(driver, wait, website_url, number, logs)
-                results.append(ScrapeResult(number_searched=number, email=email, name=name, phone=phone))
-                processed_count += 1
-            except Exception as e:
-                errors.append(f"Failed to process number {number}: {e}")
-                logs.append(f"Error processing {number}: {e}")
-                results.append(ScrapeResult(number_searched=number, email="N/A", name="N/A", phone="N/A")) # Add N/A result
-                processed_count += 1 # Still count as processed, even if failed
-
-    except WebDriverException as e:
-        error_msg = f"Critical WebDriver error during initialization or execution: {e}. Ensure Firefox and GeckoDriver are correctly set up on the server."
-        logs.append(error_msg)
-        raise HTTPException(status_code=500, detail=error_msg)
-    except Exception as e:
-        error_msg = f"An unexpected server error occurred: {e}"
-        logs.append(error_msg)
-        raise HTTPException(status_code=500, detail=error_msg)
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logs.append("WebDriver gracefully quit.")
-            except WebDriverException:
-                logs.append("WebDriver already closed or in an invalid state during quit.")
+    return _enqueue_scrape(website_url, numbers_to_scrape)
 
-    return ScrapeResponse(
-        status="success" if not errors else "completed_with_errors",
-        message="Scraping completed." if not errors else "Scraping completed with some errors. Check 'errors' list.",
-        results=results,
-        total_processed=processed_count,
-        errors=errors
-    )
-
-@app.post("/scrape_by_file", response_model=ScrapeResponse)
-async def scrape_by_file(
+@app.post("/scrape_by_file", response_model=JobStatus, status_code=202)
+def scrape_by_file(
     website_url: str = Form(DEFAULT_WEBSITE_URL),
     numbers_file: UploadFile = File(...)
 ):
     """
-    Scrapes data for numbers provided in an uploaded text file.
-    The file should contain one number per line.
+    Queues a scrape for numbers provided in an uploaded text file.
+    The file should contain one number per line. Poll /results/{job_id} for the outcome.
     """
-    file_path = os.path.join(TEMP_UPLOAD_DIR, numbers_file.filename)
     logs = []
     
     try:
-        # Save the uploaded file temporarily
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(numbers_file.file, buffer)
-        logs.append(f"Uploaded file saved to {file_path}")
-
-        numbers_to_scrape = _read_numbers_from_file_api(file_path, logs)
+        # Parse the upload in memory; it never touches the disk
+        numbers_to_scrape = _filter_numbers(numbers_file.file.read(), logs)
 
         if not numbers_to_scrape:
             raise HTTPException(status_code=400, detail="No valid numbers found in the uploaded file.")
 
-        results = []
-        errors = []
-        processed_count = 0
-
-        driver = None
-        try:
-            logs.append("Initializing Firefox WebDriver...")
-            service = FirefoxService(GeckoDriverManager().install())
-            options = webdriver.FirefoxOptions()
-            options.add_argument("--headless") # Run headless on the server
-            driver = webdriver.Firefox(service=service, options=options)
-            wait = WebDriverWait(driver, SELENIUM_WAIT_TIMEOUT)
-            logs.append("WebDriver initialized.")
-
-            for number in numbers_to_scrape:
-                try:
-                    email, name, phone = _perform_single_scrape(driver, wait, website_url, number, logs)
-                    results.append(ScrapeResult(number_searched=number, email=email, name=name, phone=phone))
-                    processed_count += 1
-                except Exception as e:
-                    errors.append(f"Failed to process number {number}: {e}")
-                    logs.append(f"Error processing {number}: {e}")
-                    results.append(ScrapeResult(number_searched=number, email="N/A", name="N/A", phone="N/A")) # Add N/A result
-                    processed_count += 1 # Still count as processed, even if failed
-
-        except WebDriverException as e:
-            error_msg = f"Critical WebDriver error during initialization or execution: {e}. Ensure Firefox and GeckoDriver are correctly set up on the server."
-            logs.append(error_msg)
-            raise HTTPException(status_code=500, detail=error_msg)
-        except Exception as e:
-            error_msg = f"An unexpected server error occurred: {e}"
-            logs.append(error_msg)
-            raise HTTPException(status_code=500, detail=error_msg)
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                    logs.append("WebDriver gracefully quit.")
-                except WebDriverException:
-                    logs.append("WebDriver already closed or in an invalid state during quit.")
+        return _enqueue_scrape(website_url, numbers_to_scrape)
 
     except HTTPException:
         raise # Re-raise FastAPI HTTP exceptions
     except Exception as e:
         logs.append(f"Error during file processing: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing file: {e}")
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logs.append(f"Cleaned up temporary file: {file_path}")
-
-    return ScrapeResponse(
-        status="success" if not errors else "completed_with_errors",
-        message="Scraping completed." if not errors else "Scraping completed with some errors. Check 'errors' list.",
-        results=results,
-        total_processed=processed_count,
-        errors=errors
-    )
 
 # --- How to Run This API ---
 # 1. Save the code above as, for example, `main.py`.
-# 2. Make sure you have `fastapi`, `uvicorn`, `selenium`, `webdriver-manager` installed:
-#    `pip install fastapi uvicorn selenium webdriver-manager`
-# 3. Run the API from your terminal:
-#    `uvicorn main:app --reload`
+# 2. Install the dependencies listed in requirements.txt, and make sure a Redis server is reachable at REDIS_URL
+#    (default `redis://localhost:6379/0`):
+#    `pip install -r requirements.txt`
+#    Scraping uses direct HTTP requests by default; set SCRAPE_BACKEND=playwright to drive headless Firefox instead
+#    (after `playwright install firefox`).
+# 3. Run the API and at least one scrape worker from your terminal (e.g. as separate systemd units):
+#    `uvicorn main:app` or `python main.py`
+#    `dramatiq main --processes 2 --threads 4`
+#    Set BROWSER_POOL_SIZE to control how many browser pages each worker process keeps warm and scraping in parallel.
 # 4. Open your browser to `http://127.0.0.1:8000/docs` to see the interactive API documentation.
 #    You can test the endpoints directly from there.
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("main:app", workers=1)